@@ -1,9 +1,10 @@
 import uuid
+import time
 import logging
+from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any
 
 from backend.financial_body import FinancialCalculator
 from backend.models import Invoice
@@ -12,6 +13,9 @@ from backend.models import Invoice
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Context returned for vendors without history; shared and read-only, so a miss allocates nothing
+_UNKNOWN_CONTEXT: Mapping[str, Any] = MappingProxyType({"risk": "UNKNOWN", "category": "General"})
+
 class WorkflowState(str, Enum):
     """Represents the lifecycle stages of a Digital Worker process."""
     PENDING = "PENDING"
@@ -25,7 +29,7 @@ class MemoryInterface:
     Abstract Protocol for Agent Memory.
     Enables swapping between MockMemory (Dev) and VectorDB (Prod).
     """
-    def retrieve_context(self, vendor_name: str) -> Dict[str, Any]:
+    def retrieve_context(self, vendor_name: str) -> Mapping[str, Any]:
         raise NotImplementedError
 
 class AgentMemory(MemoryInterface):
@@ -37,13 +41,22 @@ class AgentMemory(MemoryInterface):
     """
     def __init__(self) -> None:
         # Knowledge Graph Simulation
-        self.vendor_patterns: Dict[str, Dict[str, Any]] = {
+        raw_patterns: Dict[str, Dict[str, Any]] = {
             "dark web corp": {"risk": "HIGH", "avg_delay": 5, "category": "Suspicious"},
             "aws": {"risk": "LOW", "category": "Infrastructure"},
             "mckenzie consulting": {"risk": "MEDIUM", "category": "Professional Services"},
         }
+        # Keys are stored pre-normalized so a lookup is a single hash probe
+        self.vendor_patterns: Dict[str, Dict[str, Any]] = {
+            self._normalize(k): v for k, v in raw_patterns.items()
+        }
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        """Canonical vendor key."""
+        return name.lower().strip()
     
-    def retrieve_context(self, vendor_name: str) -> Dict[str, Any]:
+    def retrieve_context(self, vendor_name: str) -> Mapping[str, Any]:
         """
         Retrieves historical context for a given vendor.
         
@@ -51,24 +64,28 @@ class AgentMemory(MemoryInterface):
             vendor_name: The name of the vendor to look up.
             
         Returns:
-            Dictionary containing risk profile and metadata.
+            Read-only mapping containing risk profile and metadata.
         """
-        key = vendor_name.lower().strip()
-        context = self.vendor_patterns.get(key, {"risk": "UNKNOWN", "category": "General"})
-        logger.debug(f"Memory Retrieval [{key}]: {context}")
+        key = self._normalize(vendor_name)
+        context = self.vendor_patterns.get(key, _UNKNOWN_CONTEXT)
+        logger.debug("Memory Retrieval [%s]: %s", key, context)
         return context
 
-class WorkflowContext(BaseModel):
+@dataclass(slots=True)
+class WorkflowContext:
     """
     State container for a single Invoice Processing workflow.
     Equivalent to a 'Run ID' in Temporal.io.
+
+    Internal, frequently mutated state: a slotted dataclass keeps attribute writes cheap.
+    Validation happens once at the boundary, when the Invoice model is built.
     """
-    workflow_id: str = Field(..., description="Unique UUID for this execution")
-    status: WorkflowState = Field(WorkflowState.PENDING, description="Current lifecycle state")
-    invoice: Invoice = Field(..., description="The financial document being processed")
-    logs: List[str] = Field(default_factory=list, description="Audit trail of agent reasoning")
+    workflow_id: str  # Unique UUID for this execution
+    invoice: Invoice  # The financial document being processed
+    status: WorkflowState = WorkflowState.PENDING  # Current lifecycle state
+    logs: List[str] = field(default_factory=list)  # Audit trail of agent reasoning
     math_verification: Optional[Dict[str, Any]] = None
-    memory_context: Optional[Dict[str, Any]] = None
+    memory_context: Optional[Mapping[str, Any]] = None  # Read-only view; copy before mutating
     human_action_needed: Optional[str] = None
 
 class WorkflowEngine:
@@ -84,6 +101,18 @@ class WorkflowEngine:
         self.memory = AgentMemory()
         self.calculator = FinancialCalculator()
         self.active_workflows: Dict[str, WorkflowContext] = {}
+        # State-indexed buckets, maintained by _set_state (read by the UI on every rerun). Treat as read-only.
+        self.by_state: Dict[WorkflowState, Dict[str, WorkflowContext]] = {s: {} for s in WorkflowState}
+
+    @property
+    def pending_workflows(self) -> Dict[str, WorkflowContext]:
+        """Workflows awaiting a human decision, in the order they were paused. Treat as read-only."""
+        return self.by_state[WorkflowState.AWAITING_HUMAN]
+
+    @property
+    def processed_count(self) -> int:
+        """Number of workflows that reached a terminal state (APPROVED or REJECTED)."""
+        return len(self.by_state[WorkflowState.APPROVED]) + len(self.by_state[WorkflowState.REJECTED])
 
     def start_workflow(self, invoice: Invoice) -> str:
         """
@@ -99,6 +128,7 @@ class WorkflowEngine:
             invoice=invoice
         )
         self.active_workflows[w_id] = context
+        self.by_state[context.status][w_id] = context
         self._log(context, f"Workflow initialized for Invoice #{invoice.invoice_id}")
         
         # Immediate Execution Trigger
@@ -119,7 +149,7 @@ class WorkflowEngine:
             return
 
         ctx = self.active_workflows[w_id]
-        ctx.status = WorkflowState.PROCESSING
+        self._set_state(ctx, WorkflowState.PROCESSING)
         self._log(ctx, "Agent execution started.")
 
         # --- Phase 1: Context Retrieval ---
@@ -132,6 +162,12 @@ class WorkflowEngine:
             self._pause_for_human(ctx, "High Risk Vendor detected. CFO Approval Required.")
             return
 
+        # Gate 2: Simulated Large Transaction Check (> 10k)
+        # Runs before the math phase: a paused workflow would discard the math result anyway
+        if ctx.invoice.amount > 10000:
+            self._pause_for_human(ctx, "Large Transaction (> €10k). Variance Protocol initiated.")
+            return
+
         # --- Phase 2: Math Integrity Check ---
         # Assuming 21% Tax Rate for demonstration purposes
         try:
@@ -147,11 +183,6 @@ class WorkflowEngine:
                 total=ctx.invoice.amount,
                 tax_rate=tax_rate
             )
-            
-            # Simulated Large Transaction Check (> 10k)
-            if ctx.invoice.amount > 10000:
-                self._pause_for_human(ctx, "Large Transaction (> €10k). Variance Protocol initiated.")
-                return
 
         except Exception as e:
             logger.error(f"Math Engine Failure: {e}")
@@ -159,7 +190,7 @@ class WorkflowEngine:
             return
 
         # --- Phase 3: Final Decision ---
-        ctx.status = WorkflowState.APPROVED
+        self._set_state(ctx, WorkflowState.APPROVED)
         self._log(ctx, "Auto-Approval Logic satisfied. Transaction Released.")
 
     def signal_human_approval(self, w_id: str, approved: bool) -> None:
@@ -177,22 +208,28 @@ class WorkflowEngine:
 
         if approved:
             self._log(ctx, "Signal Received: CFO APPROVED. Resuming...")
-            ctx.status = WorkflowState.APPROVED
+            self._set_state(ctx, WorkflowState.APPROVED)
             ctx.human_action_needed = None
         else:
             self._log(ctx, "Signal Received: CFO REJECTED. Terminating.")
-            ctx.status = WorkflowState.REJECTED
+            self._set_state(ctx, WorkflowState.REJECTED)
             ctx.human_action_needed = None
     
     def _pause_for_human(self, ctx: WorkflowContext, reason: str) -> None:
         """Helper to transition state to PAUSED."""
-        ctx.status = WorkflowState.AWAITING_HUMAN
+        self._set_state(ctx, WorkflowState.AWAITING_HUMAN)
         ctx.human_action_needed = reason
         self._log(ctx, f"Workflow Paused: {reason}")
 
+    def _set_state(self, ctx: WorkflowContext, new_state: WorkflowState) -> None:
+        """Single entry point for status changes; keeps the by_state buckets in sync."""
+        self.by_state[ctx.status].pop(ctx.workflow_id, None)
+        ctx.status = new_state
+        self.by_state[new_state][ctx.workflow_id] = ctx
+
     def _log(self, ctx: WorkflowContext, message: str) -> None:
         """Appends a timestamped log to the audit trail."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        entry = f"[{timestamp}] {message}"
-        ctx.logs.append(entry)
-        logger.info(f"[{ctx.workflow_id}] {message}")
+        # Built from the struct_time fields directly; avoids datetime + strftime on every transition
+        lt = time.localtime()
+        ctx.logs.append(f"[{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}] {message}")
+        logger.info("[%s] %s", ctx.workflow_id, message)
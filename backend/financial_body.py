@@ -7,8 +7,15 @@ logger = logging.getLogger("FinancialBody")
 class FinancialCalculator:
     """
     Guarantees deterministic accuracy for all financial calculations.
-    Uses Python's decimal.Decimal instead of floats.
+    Uses Python's decimal.Decimal instead of floats; the per-invoice validation
+    path works on exact integer cents, which is equivalent for 2-decimal amounts.
+    Inputs with sub-cent precision fall back to the Decimal path.
     """
+
+    CENTS = 100
+    # Tax rates are scaled to parts-per-million so the cents math stays integral
+    RATE_SCALE = 1_000_000
+    TAX_TOLERANCE_CENTS = 5
     
     @staticmethod
     def _to_decimal(value: any) -> Decimal:
@@ -22,6 +29,23 @@ class FinancialCalculator:
             logger.error(f"Math Error: Could not convert {value} to Decimal")
             raise ValueError(f"Invalid financial input: {value}")
 
+    @staticmethod
+    def _to_fixed_point(value: any, scale: int) -> Optional[int]:
+        """
+        Safe conversion to an integer number of 1/scale units (scale=100 -> cents).
+        Returns None if the value is finer than 1/scale, rather than rounding it away.
+        """
+        try:
+            value = float(value)
+            units = int(round(value * scale))
+        except (TypeError, ValueError, OverflowError):
+            logger.error(f"Math Error: Could not convert {value} to fixed point (1/{scale})")
+            raise ValueError(f"Invalid financial input: {value}")
+        # Exact round trip, so float noise (3140.2799999999997) counts as sub-cent like in Decimal
+        if units / scale != value:
+            return None
+        return units
+
     @staticmethod
     def calculate_tax(amount: Decimal, rate: Decimal) -> Decimal:
         """
@@ -45,34 +69,77 @@ class FinancialCalculator:
         Returns: (IsValid, Reason, DebugDetails)
         """
         try:
-            d_sub = FinancialCalculator._to_decimal(subtotal)
-            d_tax = FinancialCalculator._to_decimal(tax_amount)
-            d_total = FinancialCalculator._to_decimal(total)
-            d_rate = FinancialCalculator._to_decimal(tax_rate)
-            
+            to_fixed = FinancialCalculator._to_fixed_point
+            sub_c = to_fixed(subtotal, FinancialCalculator.CENTS)
+            tax_c = to_fixed(tax_amount, FinancialCalculator.CENTS)
+            total_c = to_fixed(total, FinancialCalculator.CENTS)
+            rate_ppm = to_fixed(tax_rate, FinancialCalculator.RATE_SCALE)
+            if None in (sub_c, tax_c, total_c, rate_ppm):
+                return FinancialCalculator._validate_invoice_math_decimal(subtotal, tax_amount, total, tax_rate)
+
             # 1. Check Arithmetic (Sub + Tax = Total)
-            calculated_total = d_sub + d_tax
-            if calculated_total != d_total:
-                diff = d_total - calculated_total
-                return False, f"Arithmetic Error: Subtotal + Tax != Total. Diff: {diff}", {
-                    "expected_total": float(calculated_total),
-                    "claimed_total": float(d_total),
-                    "diff": float(diff)
+            calculated_total_c = sub_c + tax_c
+            if calculated_total_c != total_c:
+                diff_c = total_c - calculated_total_c
+                return False, f"Arithmetic Error: Subtotal + Tax != Total. Diff: {diff_c / 100:.2f}", {
+                    "expected_total": calculated_total_c / 100,
+                    "claimed_total": total_c / 100,
+                    "diff": diff_c / 100
                 }
 
             # 2. Check Tax Logic (Sub * Rate ~ Tax)
-            expected_tax = FinancialCalculator.calculate_tax(d_sub, d_rate)
+            # Round Half Up (away from zero) on the exact integer product
+            product = sub_c * rate_ppm
+            expected_tax_c = (abs(product) + FinancialCalculator.RATE_SCALE // 2) // FinancialCalculator.RATE_SCALE
+            if product < 0:
+                expected_tax_c = -expected_tax_c
             # Allow small variance for rounding differences (e.g. +/- 0.05)
             # Some invoices round per line item, some on total.
-            tax_diff = abs(expected_tax - d_tax)
-            if tax_diff > Decimal("0.05"):
-                return False, f"Tax Logic Error: Tax amount doesn't match rate {tax_rate}. Diff: {tax_diff}", {
-                    "expected_tax": float(expected_tax),
-                    "claimed_tax": float(d_tax),
-                    "diff": float(tax_diff)
+            tax_diff_c = abs(expected_tax_c - tax_c)
+            if tax_diff_c > FinancialCalculator.TAX_TOLERANCE_CENTS:
+                return False, f"Tax Logic Error: Tax amount doesn't match rate {tax_rate}. Diff: {tax_diff_c / 100:.2f}", {
+                    "expected_tax": expected_tax_c / 100,
+                    "claimed_tax": tax_c / 100,
+                    "diff": tax_diff_c / 100
                 }
 
             return True, "Math Validated", {}
             
         except ValueError as e:
             return False, str(e), {}
+
+    @staticmethod
+    def _validate_invoice_math_decimal(
+        subtotal: float, 
+        tax_amount: float, 
+        total: float, 
+        tax_rate: float
+    ) -> Tuple[bool, str, dict]:
+        """
+        Decimal implementation of validate_invoice_math, used for sub-cent inputs.
+        Raises ValueError on non-numeric input (handled by the caller).
+        """
+        d_sub = FinancialCalculator._to_decimal(subtotal)
+        d_tax = FinancialCalculator._to_decimal(tax_amount)
+        d_total = FinancialCalculator._to_decimal(total)
+        d_rate = FinancialCalculator._to_decimal(tax_rate)
+
+        calculated_total = d_sub + d_tax
+        if calculated_total != d_total:
+            diff = d_total - calculated_total
+            return False, f"Arithmetic Error: Subtotal + Tax != Total. Diff: {diff}", {
+                "expected_total": float(calculated_total),
+                "claimed_total": float(d_total),
+                "diff": float(diff)
+            }
+
+        expected_tax = FinancialCalculator.calculate_tax(d_sub, d_rate)
+        tax_diff = abs(expected_tax - d_tax)
+        if tax_diff > Decimal(FinancialCalculator.TAX_TOLERANCE_CENTS) / FinancialCalculator.CENTS:
+            return False, f"Tax Logic Error: Tax amount doesn't match rate {tax_rate}. Diff: {tax_diff}", {
+                "expected_tax": float(expected_tax),
+                "claimed_tax": float(d_tax),
+                "diff": float(tax_diff)
+            }
+
+        return True, "Math Validated", {}
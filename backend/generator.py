@@ -1,11 +1,16 @@
 import os
-import random
 import csv
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, timedelta
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from fpdf import FPDF
 from faker import Faker
 
 fake = Faker()
+rng = np.random.default_rng()
 
 DATA_DIR = "data"
 INVOICE_DIR = os.path.join(DATA_DIR, "invoices")
@@ -14,65 +19,69 @@ INVOICE_DIR = os.path.join(DATA_DIR, "invoices")
 DEPARTMENTS = ["IT", "Marketing", "HR", "Operations", "Legal"]
 VENDORS_COUNT = 15
 INVOICES_COUNT = 12 
+CSV_BUFFER_SIZE = 1 << 20
 
 def setup_directories():
     os.makedirs(INVOICE_DIR, exist_ok=True)
 
+def seed_generators(seed: int):
+    """Makes a run reproducible by seeding every random source the generator draws from."""
+    global rng
+    rng = np.random.default_rng(seed)
+    fake.seed_instance(seed)
+
+def _write_csv(file_name: str, fieldnames: List[str], rows: List[Dict]):
+    """Writes all rows in one call through a 1 MiB buffer (a handful of syscalls per file)."""
+    # itemgetter turns each row dict into a plain tuple in C; csv.writer skips DictWriter's per-row key checks
+    as_tuple = itemgetter(*fieldnames)
+    with open(os.path.join(DATA_DIR, file_name), "w", newline='', buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(map(as_tuple, rows))
+
 def generate_reference_data():
     """Generates CSVs for Vendors, Budgets, and Contracts."""
     
-    # 1. Vendors
-    vendors = []
-    for _ in range(VENDORS_COUNT):
-        vendor_name = fake.company()
-        risk = random.choice(["Low", "Low", "Low", "Medium", "High"]) 
-        iban = fake.iban()
-        vendors.append({
-            "vendor_name": vendor_name,
-            "iban": iban,
-            "risk_level": risk
-        })
+    # 1. Vendors (numeric draws are batched through the NumPy generator)
+    names = [fake.company() for _ in range(VENDORS_COUNT)]
+    ibans = [fake.iban() for _ in range(VENDORS_COUNT)]
+    risks = rng.choice(["Low", "Low", "Low", "Medium", "High"], VENDORS_COUNT).tolist()
+    vendors = [
+        {"vendor_name": vendor_name, "iban": iban, "risk_level": risk}
+        for vendor_name, iban, risk in zip(names, ibans, risks)
+    ]
     
     vendors.append({"vendor_name": "Dark Web Corp", "iban": fake.iban(), "risk_level": "High"})
     vendors.append({"vendor_name": "Fraud Inc", "iban": "XXINVALIDIBAN", "risk_level": "Low"})
 
-    with open(os.path.join(DATA_DIR, "vendors.csv"), "w", newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=["vendor_name", "iban", "risk_level"])
-        writer.writeheader()
-        writer.writerows(vendors)
+    _write_csv("vendors.csv", ["vendor_name", "iban", "risk_level"], vendors)
 
     # 2. Budgets
-    budgets = []
-    for dept in DEPARTMENTS:
-        budgets.append({
-            "department": dept,
-            "total_budget": round(random.uniform(50000, 200000), 2),
-            "remaining_budget": round(random.uniform(1000, 50000), 2)
-        })
+    totals = rng.uniform(50000, 200000, len(DEPARTMENTS)).round(2).tolist()
+    remaining = rng.uniform(1000, 50000, len(DEPARTMENTS)).round(2).tolist()
+    budgets = [
+        {"department": dept, "total_budget": total, "remaining_budget": left}
+        for dept, total, left in zip(DEPARTMENTS, totals, remaining)
+    ]
         
-    with open(os.path.join(DATA_DIR, "budgets.csv"), "w", newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=["department", "total_budget", "remaining_budget"])
-        writer.writeheader()
-        writer.writerows(budgets)
+    _write_csv("budgets.csv", ["department", "total_budget", "remaining_budget"], budgets)
 
     # 3. Contracts
     contracts = []
     today = date.today()
-    for v in vendors:
-        if random.random() < 0.8:
-            start_date = today - timedelta(days=random.randint(30, 300))
-            end_date = today + timedelta(days=random.randint(30, 300))
+    has_contract = (rng.random(len(vendors)) < 0.8).tolist()
+    days_before = rng.integers(30, 300, len(vendors), endpoint=True).tolist()
+    days_after = rng.integers(30, 300, len(vendors), endpoint=True).tolist()
+    for v, covered, before, after in zip(vendors, has_contract, days_before, days_after):
+        if covered:
             contracts.append({
                 "vendor_name": v["vendor_name"],
-                "start_date": start_date,
-                "end_date": end_date,
+                "start_date": today - timedelta(days=before),
+                "end_date": today + timedelta(days=after),
                 "is_active": True
             })
     
-    with open(os.path.join(DATA_DIR, "contracts.csv"), "w", newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=["vendor_name", "start_date", "end_date", "is_active"])
-        writer.writeheader()
-        writer.writerows(contracts)
+    _write_csv("contracts.csv", ["vendor_name", "start_date", "end_date", "is_active"], contracts)
         
     return vendors, budgets, contracts
 
@@ -81,68 +90,124 @@ class InvoicePDF(FPDF):
         self.set_font('Arial', 'B', 12)
         self.cell(0, 10, 'INVOICE', 0, 1, 'R')
 
-def generate_invoices(vendors):
-    """Generates PDF invoices."""
+# Vendor table of the current run, installed once per process by _init_renderer
+_vendors: List[Dict[str, str]] = []
+
+def _init_renderer(vendors: List[Dict[str, str]]):
+    """Per-process setup: ships the vendor table once so tasks only carry a vendor index."""
+    global _vendors
+    _vendors = vendors
+
+# (index, vendor_index, department, layout_type, invoice_number, invoice_date, amount)
+InvoiceTask = Tuple[int, int, str, int, str, date, float]
+
+# --- Invoice Layouts ---
+# Each layout renders the invoice body onto a page that already has the header and Arial 10 set.
+# Date and amount arrive pre-formatted so no layout converts a number to text itself.
+
+def _render_layout_1(pdf: FPDF, vendor: Dict[str, str], dept: str, inv_num: str, date_text: str, amount_text: str):
+    """Classic labelled list, top to bottom."""
+    pdf.cell(200, 10, txt=f"Vendor: {vendor['vendor_name']}", ln=1)
+    pdf.cell(200, 10, txt=f"Date: {date_text}", ln=1)
+    pdf.cell(200, 10, txt=f"Invoice #: {inv_num}", ln=1)
+    pdf.cell(200, 10, txt=f"IBAN: {vendor['iban']}", ln=1)
+    pdf.cell(200, 10, txt=f"Department: {dept}", ln=1)
+    pdf.ln(20)
+    pdf.cell(200, 10, txt=f"Total Amount: EUR {amount_text}", ln=1)
+
+def _render_layout_2(pdf: FPDF, vendor: Dict[str, str], dept: str, inv_num: str, date_text: str, amount_text: str):
+    """Right-aligned letterhead with an unlabelled vendor name."""
+    pdf.cell(200, 10, txt=vendor['vendor_name'], ln=1, align='R')
+    pdf.cell(200, 10, txt=f"IBAN: {vendor['iban']}", ln=1, align='R')
+    pdf.ln(20)
+    pdf.cell(100, 10, txt=f"Invoice #: {inv_num}", ln=0)
+    pdf.cell(100, 10, txt=f"Date: {date_text}", ln=1)
+    pdf.cell(100, 10, txt=f"Department: {dept}", ln=1)
+    pdf.ln(10)
+    pdf.cell(200, 10, txt=f"BALANCE DUE: {amount_text} EUR", ln=1, align='C')
+
+def _render_layout_3(pdf: FPDF, vendor: Dict[str, str], dept: str, inv_num: str, date_text: str, amount_text: str):
+    """Monospaced remittance slip with alternative labels."""
+    pdf.set_font("Courier", size=12)
+    pdf.cell(200, 10, txt=f"FROM: {vendor['vendor_name']}", ln=1)
+    pdf.cell(200, 10, txt=f"PAY TO: {vendor['iban']}", ln=1)
+    pdf.ln(10)
+    pdf.cell(200, 10, txt=f"REF: {inv_num} / {date_text}", ln=1)
+    pdf.cell(200, 10, txt=f"DEPT: {dept}", ln=1)
+    pdf.ln(20)
+    pdf.cell(200, 10, txt=f"TOTAL: {amount_text}", ln=1)
+
+# Indexed by layout_type - 1
+LAYOUTS = (_render_layout_1, _render_layout_2, _render_layout_3)
+
+def _render_one_invoice(task: InvoiceTask) -> str:
+    """Renders a single invoice PDF to INVOICE_DIR. Top-level so it can run in a worker process."""
+    i, vendor_i, dept, layout_type, inv_num, inv_date, amount = task
+    vendor = _vendors[vendor_i]
+    
+    pdf = InvoicePDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=10)
+    # Format the float and the date once, in the usual two-decimal invoice style
+    LAYOUTS[layout_type - 1](pdf, vendor, dept, inv_num, inv_date.isoformat(), f"{amount:.2f}")
+
+    filename = f"invoice_{i+1:03d}_{vendor['vendor_name'].replace(' ', '_')}.pdf"
+    # Serialize in memory and write the finished document in one call
+    with open(os.path.join(INVOICE_DIR, filename), "wb") as f:
+        f.write(_pdf_bytes(pdf))
+    return filename
+
+def _pdf_bytes(pdf: FPDF) -> bytes:
+    """The finished document as bytes: PyFPDF 1.7 returns a latin-1 str here, fpdf2 a bytearray."""
+    buf = pdf.output(dest='S')
+    return buf.encode("latin-1") if isinstance(buf, str) else bytes(buf)
+
+def generate_invoices(vendors, jobs: Optional[int] = None):
+    """
+    Generates PDF invoices.
+    
+    All random choices are drawn up-front in this process (so a seeded run is reproducible
+    regardless of `jobs`); rendering is then fanned out over `jobs` worker processes.
+    """
+    # Numeric draws for the whole run in one call each; the loop only indexes into them
+    vendor_idx = rng.integers(0, len(vendors), INVOICES_COUNT).tolist()
+    dept_idx = rng.integers(0, len(DEPARTMENTS), INVOICES_COUNT).tolist()
+    serials = rng.integers(1000, 9999, INVOICES_COUNT, endpoint=True).tolist()
+    amounts = rng.uniform(100, 15000, INVOICES_COUNT).round(2).tolist()
+    days_ago = rng.integers(0, 183, INVOICES_COUNT).tolist()  # Issued within the last ~6 months
+    layouts = rng.integers(1, len(LAYOUTS), INVOICES_COUNT, endpoint=True).tolist()
     
+    today = date.today()
+    tasks: List[InvoiceTask] = []
     for i in range(INVOICES_COUNT):
-        vendor = random.choice(vendors)
-        dept = random.choice(DEPARTMENTS)
-        
-        pdf = InvoicePDF()
-        pdf.add_page()
-        
-        inv_num = f"INV-{fake.year()}-{random.randint(1000, 9999)}"
-        inv_date = fake.date_between(start_date='-6m', end_date='today')
-        amount = round(random.uniform(100, 15000), 2)
-        
-        layout_type = random.choice([1, 2, 3])
-        
-        pdf.set_font("Arial", size=10)
-        
-        # Content common strings
-        str_vendor = f"Vendor: {vendor['vendor_name']}"
-        str_date = f"Date: {inv_date}"
-        str_num = f"Invoice #: {inv_num}"
-        str_iban = f"IBAN: {vendor['iban']}"
-        str_dept = f"Department: {dept}"
-        str_total = f"Total Amount: EUR {amount}"
-        
-        if layout_type == 1:
-            pdf.cell(200, 10, txt=str_vendor, ln=1)
-            pdf.cell(200, 10, txt=str_date, ln=1)
-            pdf.cell(200, 10, txt=str_num, ln=1)
-            pdf.cell(200, 10, txt=str_iban, ln=1)
-            pdf.cell(200, 10, txt=str_dept, ln=1)
-            pdf.ln(20)
-            pdf.cell(200, 10, txt=str_total, ln=1)
-            
-        elif layout_type == 2:
-            pdf.cell(200, 10, txt=f"{vendor['vendor_name']}", ln=1, align='R')
-            pdf.cell(200, 10, txt=f"IBAN: {vendor['iban']}", ln=1, align='R')
-            pdf.ln(20)
-            pdf.cell(100, 10, txt=str_num, ln=0)
-            pdf.cell(100, 10, txt=str_date, ln=1)
-            pdf.cell(100, 10, txt=str_dept, ln=1)
-            pdf.ln(10)
-            pdf.cell(200, 10, txt=f"BALANCE DUE: {amount} EUR", ln=1, align='C')
-
-        elif layout_type == 3:
-            pdf.set_font("Courier", size=12)
-            pdf.cell(200, 10, txt=f"FROM: {vendor['vendor_name']}", ln=1)
-            pdf.cell(200, 10, txt=f"PAY TO: {vendor['iban']}", ln=1)
-            pdf.ln(10)
-            pdf.cell(200, 10, txt=f"REF: {inv_num} / {inv_date}", ln=1)
-            pdf.cell(200, 10, txt=f"DEPT: {dept}", ln=1)
-            pdf.ln(20)
-            pdf.cell(200, 10, txt=f"TOTAL: {amount}", ln=1)
-
-        filename = f"invoice_{i+1:03d}_{vendor['vendor_name'].replace(' ', '_')}.pdf"
-        pdf.output(os.path.join(INVOICE_DIR, filename))
+        inv_num = f"INV-{fake.year()}-{serials[i]}"
+        inv_date = today - timedelta(days=days_ago[i])
+        tasks.append((i, vendor_idx[i], DEPARTMENTS[dept_idx[i]], layouts[i], inv_num, inv_date, amounts[i]))
+    
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        _init_renderer(vendors)
+        for task in tasks:
+            _render_one_invoice(task)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_renderer, initargs=(vendors,)) as executor:
+            chunksize = max(1, len(tasks) // (4 * jobs))
+            for _ in executor.map(_render_one_invoice, tasks, chunksize=chunksize):
+                pass
         
     print(f"Generated {INVOICES_COUNT} invoices.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates mock reference data and PDF invoices.")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes for PDF rendering (default: CPU count, 1 = in-process)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for a reproducible data set (default: fresh random data)")
+    args = parser.parse_args()
+    
+    if args.seed is not None:
+        seed_generators(args.seed)
     setup_directories()
     vendors, budgets, contracts = generate_reference_data()
-    generate_invoices(vendors)
+    generate_invoices(vendors, jobs=args.jobs)
     print("Mock data generation complete.")
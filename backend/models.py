@@ -1,8 +1,12 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Optional
 from datetime import date as DateType
 from enum import Enum
 
+# ISO-4217 style code: 3 characters, upper-cased.
+# Declared as constraints so validation stays inside pydantic-core (no Python validator call per invoice).
+CurrencyCode = Annotated[str, StringConstraints(min_length=3, max_length=3, to_upper=True)]
+
 class RiskLevel(str, Enum):
     """Enumeration for transaction risk levels."""
     LOW = "Low"
@@ -23,19 +27,13 @@ class Invoice(BaseModel):
     iban: str = Field(..., description="International Bank Account Number")
     date: Optional[DateType] = Field(None, description="Issue date of the invoice")
     amount: float = Field(..., gt=0, description="Total invoice amount")
-    currency: str = Field("EUR", description="Currency code (e.g., EUR, USD)")
+    currency: CurrencyCode = Field("EUR", description="Currency code (e.g., EUR, USD)")
     department: str = Field("Unknown", description="Assigned department for the expense")
     items: list[LineItem] = Field(default_factory=list, description="List of items in the invoice")
     
     # Metadata for processing
     file_path: Optional[str] = Field(None, description="Path to the source PDF file")
 
-    @validator('currency')
-    def validate_currency(cls, v):
-        if len(v) != 3:
-            raise ValueError('Currency must be a 3-letter code')
-        return v.upper()
-
 class CheckStatus(str, Enum):
     """Possible outcomes of a logic gate check."""
     PASS = "PASS"
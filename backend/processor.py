@@ -1,13 +1,25 @@
 import pdfplumber
 import re
+import os
+import hashlib
+import tempfile
 import logging
-from datetime import datetime, date
-from typing import Optional, List
+from collections import OrderedDict
+from contextlib import closing, suppress
+from datetime import date
+from typing import Dict, Iterator, Optional
 from backend.models import Invoice
 
 # Configure Module Logger
 logger = logging.getLogger(__name__)
 
+# Separator translation tables for _normalize_currency_string (one C-level pass each)
+_EU_SEPARATORS = str.maketrans({'.': None, ',': '.'})   # 1.234,56 -> 1234.56
+_US_SEPARATORS = str.maketrans({',': None})             # 1,234.56 -> 1234.56
+_COMMA_DECIMAL = str.maketrans({',': '.'})              # 12,50    -> 12.50
+# Deletes every character regex \s matches (str.isspace; the highest is U+3000)
+_STRIP_WHITESPACE = str.maketrans('', '', ''.join(c for c in map(chr, range(0x3001)) if c.isspace()))
+
 class PDFProcessor:
     """
     Handles extraction of structured financial data from Unstructured PDF Invoices.
@@ -18,19 +30,41 @@ class PDFProcessor:
     - Separation of Concerns
     """
     
-    # Regex Patterns (Constants)
-    VENDOR_PATTERN = r"(?:Vendor|FROM|Issuer):\s*(.+)"
-    IBAN_PATTERN = r"(?:IBAN|Account|PAY TO)[:,]?\s*([A-Z]{2}[0-9A-Z\s]{13,32})"
-    INVOICE_ID_PATTERNS = [
-        r"(?:Invoice #|REF|Invoice Number|ID):\s*([A-Z0-9\-/]+)",
-        r"INV-\d{4}-\d+"
-    ]
-    DATE_PATTERNS = [
-        r"(?:Date|Issued):\s*(\d{4}-\d{2}-\d{2})",
-        r"(\d{4}-\d{2}-\d{2})"
-    ]
-    AMOUNT_PATTERN = r"(?:Total Amount|BALANCE DUE|TOTAL|Grand Total)[:\s]*(?:EUR|€)?\s*([\d\.,]+)"
-    DEPT_PATTERN = r"(?:Department|DEPT|Cost Center):\s*(\w+)"
+    # Regex Patterns (Constants). Each field's value is captured by a named group;
+    # labelled patterns come before their unlabelled fallbacks.
+    FIELD_PATTERNS = (
+        ("vendor", r"(?:Vendor|FROM|Issuer):\s*(?P<vendor>.+)"),
+        ("iban", r"(?:IBAN|Account|PAY TO)[:,]?\s*(?P<iban>[A-Z]{2}[0-9A-Z\s]{13,32})"),
+        ("invoice_id", r"(?:Invoice #|REF|Invoice Number|ID):\s*(?P<invoice_id>[A-Z0-9\-/]+)"),
+        ("invoice_ref", r"(?P<invoice_ref>INV-\d{4}-\d+)"),
+        ("date", r"(?:Date|Issued):\s*(?P<date>\d{4}-\d{2}-\d{2})"),
+        ("any_date", r"(?P<any_date>\d{4}-\d{2}-\d{2})"),
+        ("amount", r"(?:Total Amount|BALANCE DUE|TOTAL|Grand Total)[:\s]*(?:EUR|€)?\s*(?P<amount>[\d\.,]+)"),
+        ("department", r"(?:Department|DEPT|Cost Center):\s*(?P<department>\w+)"),
+    )
+    # Compiled once at class load. One anchored-by-keyword search per field stops at
+    # its first hit, which beats a fused alternation that has to walk the whole text.
+    FIELD_SEARCHES = tuple((name, re.compile(pattern, re.IGNORECASE)) for name, pattern in FIELD_PATTERNS)
+    # Labelled fields; once all of them have matched, later pages are not read
+    REQUIRED_FIELDS = frozenset({"vendor", "iban", "invoice_id", "date", "amount", "department"})
+    # Vendor fallback: generic document titles to skip, and how far down the page to look
+    VENDOR_IGNORE = frozenset({"INVOICE", "BILL", "RECEIPT", "CREDIT NOTE"})
+    VENDOR_FALLBACK_LINES = 10
+    # Parsed invoices kept in memory, keyed by the SHA-256 of the PDF bytes
+    CACHE_SIZE = 256
+    # Part of every persisted cache file name. Bump whenever extraction logic changes
+    # so entries written by an older extractor are never served.
+    EXTRACTOR_VERSION = 2
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Optional directory where parsed invoices are persisted
+                (one JSON file per PDF content hash) so unchanged files are
+                not re-extracted across runs.
+        """
+        self.cache_dir = cache_dir
+        self._cache: "OrderedDict[str, Invoice]" = OrderedDict()
 
     def parse(self, file_path: str) -> Invoice:
         """
@@ -49,121 +83,190 @@ class PDFProcessor:
         logger.info(f"Starting extraction for: {file_path}")
         
         try:
-            raw_text = self._extract_text_from_pdf(file_path)
+            digest = self._fingerprint(file_path)
+            cached = self._cache_get(digest)
+            if cached is not None:
+                logger.info(f"Cache hit for {file_path} (Invoice #{cached.invoice_id})")
+                return cached.model_copy(update={"file_path": file_path}, deep=True)
+
+            # Scan page by page; most invoices carry every field on page 1
+            fields: Dict[str, str] = {}
+            # First page with any text; only the vendor fallback needs raw text
+            raw_text = ""
+            with closing(self._iter_page_texts(file_path)) as page_texts:
+                for page_text in page_texts:
+                    if not raw_text:
+                        raw_text = page_text.strip()
+                    self._scan_fields(page_text, fields)
+                    if self.REQUIRED_FIELDS <= fields.keys():
+                        break
+
             if not raw_text:
                 raise ValueError(f"No text content found in {file_path}")
             
             # Map extraction logic
             invoice_data = Invoice(
-                invoice_id=self._extract_invoice_id(raw_text),
-                vendor_name=self._extract_vendor(raw_text),
-                iban=self._extract_iban(raw_text),
-                date=self._extract_date(raw_text),
-                amount=self._extract_amount(raw_text),
+                invoice_id=self._extract_invoice_id(fields),
+                vendor_name=self._extract_vendor(fields, raw_text),
+                iban=self._extract_iban(fields),
+                date=self._extract_date(fields),
+                amount=self._extract_amount(fields),
                 currency="EUR",  # Defaulting for MVP
-                department=self._extract_department(raw_text),
+                department=self._extract_department(fields),
                 file_path=file_path,
                 items=[] # Line items scope for V2
             )
             
             logger.info(f"Successfully parsed Invoice #{invoice_data.invoice_id} from {invoice_data.vendor_name}")
+            self._cache_put(digest, invoice_data.model_copy(deep=True))
             return invoice_data
 
         except Exception as e:
             logger.error(f"Failed to process {file_path}: {str(e)}", exc_info=True)
             raise RuntimeError(f"Invoice processing failed: {e}") from e
 
-    def _extract_text_from_pdf(self, path: str) -> str:
-        """Helper to safely extract text from all pages."""
-        text_content: List[str] = []
+    @staticmethod
+    def _fingerprint(path: str) -> str:
+        """Content hash of the PDF; identical bytes parse to identical invoices."""
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def _cache_get(self, digest: str) -> Optional[Invoice]:
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            return self._cache[digest]
+
+        if self.cache_dir:
+            cache_file = self._cache_file(digest)
+            if os.path.exists(cache_file):
+                # The cache only speeds parsing up: a broken entry means a fresh parse, never a failure
+                try:
+                    with open(cache_file, "r", encoding="utf-8") as f:
+                        invoice = Invoice.model_validate_json(f.read())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable cache entry {cache_file}: {e}")
+                    return None
+                self._remember(digest, invoice)
+                return invoice
+        return None
+
+    def _cache_put(self, digest: str, invoice: Invoice) -> None:
+        self._remember(digest, invoice)
+        if not self.cache_dir:
+            return
+
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write aside and rename into place so readers never see a partial entry
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                f.write(invoice.model_dump_json())
+            os.replace(tmp_path, self._cache_file(digest))
+        except OSError as e:
+            logger.warning(f"Could not write parse cache entry for {digest}: {e}")
+            if tmp_path:
+                with suppress(OSError):
+                    os.remove(tmp_path)
+
+    def _cache_file(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"v{self.EXTRACTOR_VERSION}-{digest}.json")
+
+    def _remember(self, digest: str, invoice: Invoice) -> None:
+        self._cache[digest] = invoice
+        self._cache.move_to_end(digest)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _iter_page_texts(self, path: str) -> Iterator[str]:
+        """Yields the text of each non-empty page, releasing its layout objects before the next one."""
         with pdfplumber.open(path) as pdf:
             for page in pdf.pages:
                 extracted = page.extract_text()
+                page.close()
                 if extracted:
-                    text_content.append(extracted)
-        return "\n".join(text_content).strip()
+                    yield extracted
 
-    def _extract_vendor(self, text: str) -> str:
-        match = re.search(self.VENDOR_PATTERN, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        
-        # Fallback: First non-generic line heuristic
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        ignore_list = {"INVOICE", "BILL", "RECEIPT", "CREDIT NOTE"}
+    def _scan_fields(self, text: str, fields: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Searches the text for every field not yet in `fields`, keeping the first match of each."""
+        if fields is None:
+            fields = {}
+        for name, pattern in self.FIELD_SEARCHES:
+            if name not in fields:
+                match = pattern.search(text)
+                if match:
+                    fields[name] = match.group(1)
+        return fields
+
+    def _extract_vendor(self, fields: Dict[str, str], text: str) -> str:
+        if "vendor" in fields:
+            return fields["vendor"].strip()
         
-        for line in lines:
-            if line.upper() not in ignore_list:
+        # Fallback: First non-generic line heuristic, within the letterhead lines only
+        for line in text.split('\n', self.VENDOR_FALLBACK_LINES)[:self.VENDOR_FALLBACK_LINES]:
+            line = line.strip()
+            if line and line.upper() not in self.VENDOR_IGNORE:
                 return line
         return "Unknown Vendor"
 
-    def _extract_iban(self, text: str) -> str:
-        match = re.search(self.IBAN_PATTERN, text, re.IGNORECASE)
-        if match:
-            raw = match.group(1).strip()
+    def _extract_iban(self, fields: Dict[str, str]) -> str:
+        if "iban" in fields:
+            raw = fields["iban"].strip()
             # Remove spaces/newlines to standardize
-            clean = re.sub(r'[\s\n]', '', raw)
+            clean = raw.translate(_STRIP_WHITESPACE)
             return clean
         return "UNKNOWN"
 
-    def _extract_invoice_id(self, text: str) -> str:
-        for pattern in self.INVOICE_ID_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
+    def _extract_invoice_id(self, fields: Dict[str, str]) -> str:
+        for key in ("invoice_id", "invoice_ref"):
+            if key in fields:
                 # Handle cases like "INV-123 / 2023"
-                return match.group(1).split('/')[0].strip()
+                return fields[key].split('/')[0].strip()
         return "UNKNOWN"
 
-    def _extract_date(self, text: str) -> Optional[date]:
-        for pattern in self.DATE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
+    def _extract_date(self, fields: Dict[str, str]) -> Optional[date]:
+        for key in ("date", "any_date"):
+            if key in fields:
+                # The pattern guarantees the YYYY-MM-DD shape; only the calendar needs checking
+                value = fields[key]
                 try:
-                    return datetime.strptime(match.group(1).strip(), "%Y-%m-%d").date()
+                    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
                 except ValueError:
                     continue
         return None
 
-    def _extract_amount(self, text: str) -> float:
-        match = re.search(self.AMOUNT_PATTERN, text, re.IGNORECASE)
-        if match:
-            raw_val = match.group(1).strip()
+    def _extract_amount(self, fields: Dict[str, str]) -> float:
+        if "amount" in fields:
+            raw_val = fields["amount"].strip()
             return self._normalize_currency_string(raw_val)
         return 0.0
 
-    def _extract_department(self, text: str) -> str:
-        match = re.search(self.DEPT_PATTERN, text, re.IGNORECASE)
-        return match.group(1).strip() if match else "Unknown"
+    def _extract_department(self, fields: Dict[str, str]) -> str:
+        return fields["department"].strip() if "department" in fields else "Unknown"
 
     def _normalize_currency_string(self, value_str: str) -> float:
         """
         Smartly handles EU (1.234,56) vs US (1,234.56) number formats.
         """
+        last_comma = value_str.rfind(',')
+        last_dot = value_str.rfind('.')
+
+        # 1. Mixed delimiters: whichever comes last is the decimal separator
+        if last_comma >= 0 and last_dot >= 0:
+            table = _EU_SEPARATORS if last_comma > last_dot else _US_SEPARATORS
+
+        # 2. Simple comma (could be decimal or thousands)
+        elif last_comma >= 0:
+            # If last part is 2 digits, assume decimal (e.g. ,50) -> EU
+            # If 3 digits, assume thousands (e.g. 12,000) -> US
+            # This is a heuristic; risky but necessary without locale hints.
+            table = _COMMA_DECIMAL if len(value_str) - last_comma == 3 else _US_SEPARATORS
+
+        else:
+            table = None
+
         try:
-            # 1. Check for mixed delimiters to guess locale
-            if ',' in value_str and '.' in value_str:
-                last_comma = value_str.rfind(',')
-                last_dot = value_str.rfind('.')
-                
-                if last_comma > last_dot: 
-                    # EU Format: 1.234,56 -> 1234.56
-                    value_str = value_str.replace('.', '').replace(',', '.')
-                else:
-                    # US Format: 1,234.56 -> 1234.56
-                    value_str = value_str.replace(',', '')
-            
-            # 2. Check for simple comma (could be decimal or thousands)
-            elif ',' in value_str:
-                # If last part is 2 digits, assume decimal (e.g. ,50) -> EU
-                # If 3 digits, assume thousands (e.g. 12,000) -> US
-                # This is a heuristic; risky but necessary without locale hints.
-                parts = value_str.split(',')
-                if len(parts[-1]) == 2:
-                    value_str = value_str.replace(',', '.')
-                else:
-                    value_str = value_str.replace(',', '')
-
-            return float(value_str)
+            return float(value_str.translate(table) if table else value_str)
         except ValueError:
             logger.warning(f"Could not parse currency value: {value_str}")
             return 0.0
@@ -1,3 +1,4 @@
+import itertools
 import streamlit as st
 from backend.agent_brain import WorkflowEngine, WorkflowState
 from frontend.ui_utils import status_pill
@@ -12,8 +13,9 @@ def render_activity_stream(engine: WorkflowEngine):
     # 3-Column Key Metrics
     col1, col2, col3 = st.columns(3)
     
-    pending_count = len([w for w in engine.active_workflows.values() if w.status == WorkflowState.AWAITING_HUMAN])
-    processed_count = len([w for w in engine.active_workflows.values() if w.status in [WorkflowState.APPROVED, WorkflowState.REJECTED]])
+    pending = engine.pending_workflows
+    pending_count = len(pending)
+    processed_count = engine.processed_count
     
     col1.metric("Active Workflows", len(engine.active_workflows))
     col2.metric("Attention Needed", pending_count, delta_color="inverse" if pending_count > 0 else "off")
@@ -24,33 +26,38 @@ def render_activity_stream(engine: WorkflowEngine):
     # List of Items
     st.markdown("#### Recent Transactions")
     
-    # Sort: Pending first, then by ID
-    sorted_workflows = sorted(
-        engine.active_workflows.items(), 
-        key=lambda x: 0 if x[1].status == WorkflowState.AWAITING_HUMAN else 1
+    # Order: Pending first, then the rest in start order (single linear pass, no sort)
+    ordered_workflows = itertools.chain(
+        pending.items(),
+        ((w_id, ctx) for w_id, ctx in engine.active_workflows.items() if ctx.status != WorkflowState.AWAITING_HUMAN)
     )
     
-    for w_id, ctx in sorted_workflows:
+    for w_id, ctx in ordered_workflows:
+        # Read each field once per card
+        inv = ctx.invoice
+        status = ctx.status
+        reason = ctx.human_action_needed
+        is_pending = (status == WorkflowState.AWAITING_HUMAN)
+
         # Card Layout
-        expanded_state = (ctx.status == WorkflowState.AWAITING_HUMAN)
-        with st.expander(f"{ctx.invoice.vendor_name} — €{ctx.invoice.amount:,.2f}", expanded=expanded_state):
+        with st.expander(f"{inv.vendor_name} — €{inv.amount:,.2f}", expanded=is_pending):
             
             c1, c2 = st.columns([2, 1])
             
             with c1:
-                st.markdown(status_pill(ctx.status.value), unsafe_allow_html=True)
-                st.caption(f"Invoice: {ctx.invoice.invoice_id} | ID: {w_id}")
+                st.markdown(status_pill(status.value), unsafe_allow_html=True)
+                st.caption(f"Invoice: {inv.invoice_id} | ID: {w_id}")
                 
-                if ctx.human_action_needed:
-                    st.error(f"Reason: {ctx.human_action_needed}")
+                if reason:
+                    st.error(f"Reason: {reason}")
                 
                 st.markdown("**Agent Thought Process:**")
-                for log in ctx.logs:
-                    st.text(f"• {log}")
+                # One text element for the whole trail instead of one widget per line
+                st.text("\n".join(f"• {log}" for log in ctx.logs))
 
             with c2:
                 # Action Buttons (Only if pending)
-                if ctx.status == WorkflowState.AWAITING_HUMAN:
+                if is_pending:
                     st.markdown("##### &nbsp; Decision Required")
                     if st.button("Approve", key=f"app_{w_id}", type="primary"):
                         engine.signal_human_approval(w_id, True)
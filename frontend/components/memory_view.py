@@ -1,7 +1,16 @@
 import streamlit as st
 import pandas as pd
+from typing import Any, Dict
 from backend.agent_brain import WorkflowEngine
 
+@st.cache_data(show_spinner=False)
+def _memory_frame(vendor_patterns: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Tabular view of the memory store.
+    Cached across reruns; only rebuilt when the vendor patterns change.
+    """
+    return pd.DataFrame([{"Vendor": vendor.title(), **context} for vendor, context in vendor_patterns.items()])
+
 def render_memory_view(engine: WorkflowEngine):
     """
     Renders the internal state of the Agent's memory.
@@ -9,18 +18,13 @@ def render_memory_view(engine: WorkflowEngine):
     st.title("Long-Term Memory")
     st.markdown("The Agent uses this Vector Context to make decisions on Vendors.")
     
-    data = []
     # Accessing internal mock memory directly for visualization
     # In production, this would query the Vector DB stats API
-    if hasattr(engine.memory, 'vendor_patterns'):
-        params = engine.memory.vendor_patterns
-        for vendor, context in params.items():
-            row = {"Vendor": vendor.title(), **context}
-            data.append(row)
+    params = getattr(engine.memory, 'vendor_patterns', None)
     
-    if data:
+    if params:
         st.dataframe(
-            pd.DataFrame(data), 
+            _memory_frame(params), 
             use_container_width=True,
             column_config={
                 "risk": st.column_config.TextColumn("Risk Profile"),
@@ -1,5 +1,5 @@
 import streamlit as st
-from backend.agent_brain import WorkflowEngine, WorkflowState
+from backend.agent_brain import WorkflowEngine
 
 def render_review_queue(engine: WorkflowEngine):
     """
@@ -8,7 +8,7 @@ def render_review_queue(engine: WorkflowEngine):
     st.title("Review Queue")
     st.markdown("Detailed inspection of exceptions blocked by the Agent.")
     
-    to_review = [w for w in engine.active_workflows.values() if w.status == WorkflowState.AWAITING_HUMAN]
+    to_review = list(engine.pending_workflows.values())
     
     if not to_review:
         st.success("All caught up! No exceptions pending.")
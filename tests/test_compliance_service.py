@@ -0,0 +1,133 @@
+import pytest
+from datetime import date
+from backend.models import Invoice, CheckStatus
+from backend.services import ComplianceService
+
+class TestComplianceService:
+    """
+    Verifies the Logic Gates of the Compliance Engine.
+    Constraint: batch and single-invoice processing MUST reach identical decisions.
+    """
+
+    @pytest.fixture(autouse=True)
+    def service(self, tmp_path):
+        (tmp_path / "vendors.csv").write_text(
+            "vendor_name,iban,risk_level\n"
+            "Acme BV,NL91ABNA0417164300,Low\n"
+            "Dark Web Corp,NL20INGB0001234567,High\n"
+        )
+        (tmp_path / "budgets.csv").write_text(
+            "department,total_budget,remaining_budget\n"
+            "IT,100000.0,5000.0\n"
+        )
+        (tmp_path / "contracts.csv").write_text(
+            "vendor_name,start_date,end_date,is_active\n"
+            "Acme BV,2024-01-01,2024-12-31,True\n"
+            "Acme BV,2025-01-01,2025-12-31,False\n"
+            "Dark Web Corp,2024-01-01,2024-12-31,True\n"
+        )
+        self.data_dir = tmp_path
+        self.service = ComplianceService(data_sources=str(tmp_path))
+
+    def _invoice(self, **overrides) -> Invoice:
+        fields = dict(
+            invoice_id="INV-2024-001",
+            vendor_name="Acme BV",
+            iban="NL91ABNA0417164300",
+            date=date(2024, 6, 1),
+            amount=1210.00,
+            department="IT",
+        )
+        fields.update(overrides)
+        return Invoice(**fields)
+
+    def test_golden_path_is_approved(self):
+        """
+        Known vendor, authorized IBAN, budget headroom and an active contract.
+        """
+        result = self.service.process_invoice(self._invoice(vendor_name="  acme bv "))
+        assert result.final_status == "APPROVED"
+        assert all(c.status == CheckStatus.PASS for c in result.checks)
+        # All checks of one scan share a single timestamp
+        assert len({c.timestamp for c in result.checks}) == 1
+
+    def test_inactive_contract_does_not_cover(self):
+        """
+        Only the 2024 agreement is active; a 2025 invoice is out of coverage.
+        """
+        result = self.service.process_invoice(self._invoice(date=date(2025, 6, 1)))
+        contract = next(c for c in result.checks if c.check_name == "Contract Check")
+        assert contract.status == CheckStatus.FAIL
+
+    def test_batch_matches_single_invoice_processing(self):
+        """
+        The vectorized batch path must agree check-for-check with process_invoice.
+        """
+        invoices = [
+            self._invoice(),
+            self._invoice(vendor_name="Dark Web Corp", iban="NL20INGB0001234567"),
+            self._invoice(vendor_name="First Time Supplier"),
+            self._invoice(iban="UNKNOWN"),
+            self._invoice(amount=9999.99),
+            self._invoice(department="Unknown"),
+            self._invoice(department="Legal"),
+            self._invoice(date=None),
+            self._invoice(date=date(2025, 6, 1)),
+        ]
+
+        single = [self.service.process_invoice(inv) for inv in invoices]
+        batch = self.service.process_invoices_batch(invoices)
+
+        assert len(batch) == len(single)
+        for expected, actual in zip(single, batch):
+            assert actual.invoice == expected.invoice
+            assert actual.final_status == expected.final_status
+            assert actual.risk_score == expected.risk_score
+            assert [(c.check_name, c.status, c.message) for c in actual.checks] == \
+                   [(c.check_name, c.status, c.message) for c in expected.checks]
+
+    def test_batch_of_nothing(self):
+        assert self.service.process_invoices_batch([]) == []
+
+    def _reload_with(self, file_name: str, content: str) -> ComplianceService:
+        (self.data_dir / file_name).write_text(content)
+        return ComplianceService(data_sources=str(self.data_dir))
+
+    def test_truthy_is_active_spelling(self):
+        service = self._reload_with("contracts.csv",
+            "vendor_name,start_date,end_date,is_active\n"
+            "Acme BV,2024-01-01,2024-12-31,yes\n"
+        )
+        assert service.process_invoice(self._invoice()).final_status == "APPROVED"
+
+    def test_missing_end_date_column_is_open_ended(self):
+        service = self._reload_with("contracts.csv",
+            "vendor_name,start_date,is_active\n"
+            "Acme BV,2024-01-01,True\n"
+        )
+        assert service.process_invoice(self._invoice(date=date(2030, 1, 1))).final_status == "APPROVED"
+
+    def test_unparseable_end_date_does_not_cover(self):
+        """
+        A bound that is present but not a date must not be read as open-ended.
+        """
+        service = self._reload_with("contracts.csv",
+            "vendor_name,start_date,end_date,is_active\n"
+            "Acme BV,2024-01-01,TBD,True\n"
+        )
+        result = service.process_invoice(self._invoice(date=date(2090, 1, 1)))
+        contract = next(c for c in result.checks if c.check_name == "Contract Check")
+        assert contract.status == CheckStatus.FAIL
+
+    def test_bad_cell_does_not_blank_other_tables(self):
+        """
+        An unparseable budget figure only affects that department; vendors and contracts still load.
+        """
+        service = self._reload_with("budgets.csv",
+            "department,total_budget,remaining_budget\n"
+            "IT,100000.0,abc\n"
+        )
+        result = service.process_invoice(self._invoice())
+        statuses = {c.check_name: c.status for c in result.checks}
+        assert statuses.pop("Budget Check") == CheckStatus.FAIL
+        assert all(status == CheckStatus.PASS for status in statuses.values())
@@ -76,3 +76,38 @@ class TestFinancialIntegrity:
         is_valid, reason, debug = self.calc.validate_invoice_math(subtotal, tax, total)
         assert is_valid is False
         assert "Tax Logic Error" in reason
+
+    def test_tax_tolerance_boundary(self):
+        """
+        Rounding variance up to 5 cents is accepted, anything above is flagged.
+        """
+        # 100.00 * 0.21 = 21.00; claimed 21.05 / 21.06
+        assert self.calc.validate_invoice_math(100.00, 21.05, 121.05)[0] is True
+        assert self.calc.validate_invoice_math(100.00, 21.06, 121.06)[0] is False
+
+    def test_tax_rounding_half_up(self):
+        """
+        10.50 * 0.21 = 2.205 -> 2.21 (Round Half Up), so 2.21 is exact.
+        """
+        is_valid, _, _ = self.calc.validate_invoice_math(10.50, 2.21, 12.71, tax_rate=0.21)
+        assert is_valid is True
+
+    def test_sub_cent_input_is_not_rounded(self):
+        """
+        Amounts finer than a cent are compared exactly, never rounded to cents first.
+        """
+        # 10.125 + 2.13 == 12.255 exactly
+        assert self.calc.validate_invoice_math(10.125, 2.13, 12.255)[0] is True
+        # 100.004 + 21.00 != 121.00 (off by 0.004)
+        is_valid, reason, _ = self.calc.validate_invoice_math(100.004, 21.0, 121.0)
+        assert is_valid is False
+        assert "Arithmetic Error" in reason
+
+    def test_invalid_financial_input(self):
+        """
+        Non-numeric input is reported, never raised.
+        """
+        is_valid, reason, debug = self.calc.validate_invoice_math("abc", 21.00, 121.00)
+        assert is_valid is False
+        assert "Invalid financial input" in reason
+        assert debug == {}
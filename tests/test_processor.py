@@ -0,0 +1,113 @@
+import os
+import shutil
+import pytest
+from backend.processor import PDFProcessor
+
+# Committed fixture (data/invoices is regenerated by backend/generator.py)
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "fixtures", "sample_invoice.pdf")
+
+class TestPDFProcessorCache:
+    """
+    Verifies the content-hash cache in front of PDF extraction.
+    Constraint: a cache hit MUST return the same invoice a fresh parse would.
+    """
+
+    @pytest.fixture(autouse=True)
+    def sample(self, tmp_path):
+        self.pdf = str(tmp_path / "invoice.pdf")
+        shutil.copy(SAMPLE_PDF, self.pdf)
+        self.cache_dir = str(tmp_path / "cache")
+
+    def _no_extraction(self, *args, **kwargs):
+        raise AssertionError("PDF text was extracted on a cache hit")
+
+    def test_unchanged_file_skips_extraction(self, tmp_path, monkeypatch):
+        processor = PDFProcessor()
+        first = processor.parse(self.pdf)
+        assert (first.invoice_id, first.vendor_name, first.amount) == ("INV-2024-001", "Acme BV", 1210.0)
+
+        monkeypatch.setattr(processor, "_iter_page_texts", self._no_extraction)
+        assert processor.parse(self.pdf) == first
+
+        # Same bytes under another name: cached fields, caller's path
+        renamed = str(tmp_path / "renamed.pdf")
+        shutil.copy(self.pdf, renamed)
+        hit = processor.parse(renamed)
+        assert hit.file_path == renamed
+        assert hit.model_dump(exclude={"file_path"}) == first.model_dump(exclude={"file_path"})
+
+    def test_cache_persists_across_instances(self, monkeypatch):
+        first = PDFProcessor(cache_dir=self.cache_dir).parse(self.pdf)
+
+        fresh = PDFProcessor(cache_dir=self.cache_dir)
+        monkeypatch.setattr(fresh, "_iter_page_texts", self._no_extraction)
+        assert fresh.parse(self.pdf) == first
+
+    def test_unusable_cache_dir_does_not_fail_parse(self):
+        """
+        A cache directory that cannot be created (here: it is a file) only disables persistence.
+        """
+        blocker = self.cache_dir
+        open(blocker, "w").close()
+        assert PDFProcessor(cache_dir=blocker).parse(self.pdf).invoice_id
+
+class TestCurrencyNormalization:
+    """
+    Verifies the EU/US amount heuristic.
+    Constraint: the separator that appears last is the decimal separator.
+    """
+
+    def setup_method(self):
+        self.processor = PDFProcessor()
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("1.234,56", 1234.56),   # EU
+        ("1,234.56", 1234.56),   # US
+        ("12,50", 12.5),         # Comma decimal
+        ("12,000", 12000.0),     # Comma thousands
+        ("1.234", 1.234),
+        ("100", 100.0),
+        ("abc", 0.0),
+    ])
+    def test_separator_heuristic(self, raw, expected):
+        assert self.processor._normalize_currency_string(raw) == expected
+
+class TestPageScanning:
+    """
+    Verifies page-level early exit.
+    Constraint: pages after the one completing every labelled field MUST NOT be read.
+    """
+
+    PAGE_ONE = "Vendor: Acme BV\nInvoice #: INV-2024-001\nDate: 2024-06-01\nIBAN: NL91ABNA0417164300\nDepartment: IT"
+    PAGE_TWO = "Total Amount: EUR 1.210,00"
+
+    @pytest.fixture(autouse=True)
+    def processor(self, tmp_path):
+        self.pdf = str(tmp_path / "stub.pdf")
+        (tmp_path / "stub.pdf").write_bytes(b"stub")
+        self.processor = PDFProcessor()
+        self.pages_read = 0
+
+    def _pages(self, *texts):
+        def iter_page_texts(path):
+            for text in texts:
+                self.pages_read += 1
+                yield text
+        return iter_page_texts
+
+    def test_fields_are_collected_across_pages(self, monkeypatch):
+        monkeypatch.setattr(self.processor, "_iter_page_texts", self._pages(self.PAGE_ONE, self.PAGE_TWO))
+        invoice = self.processor.parse(self.pdf)
+        assert (invoice.vendor_name, invoice.department, invoice.amount) == ("Acme BV", "IT", 1210.0)
+        assert self.pages_read == 2
+
+    def test_stops_once_every_field_matched(self, monkeypatch):
+        complete = self.PAGE_ONE + "\n" + self.PAGE_TWO
+        monkeypatch.setattr(self.processor, "_iter_page_texts", self._pages(complete, "Terms and conditions", "Appendix"))
+        assert self.processor.parse(self.pdf).invoice_id == "INV-2024-001"
+        assert self.pages_read == 1
+
+    def test_vendor_fallback_skips_blank_pages(self, monkeypatch):
+        unlabelled = self.PAGE_ONE.replace("Vendor: ", "")
+        monkeypatch.setattr(self.processor, "_iter_page_texts", self._pages("  \n", unlabelled, self.PAGE_TWO))
+        assert self.processor.parse(self.pdf).vendor_name == "Acme BV"